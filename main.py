@@ -1,22 +1,108 @@
+import time
+_IMPORT_START = time.perf_counter()
+
+import argparse
 import os
-import sys
 
 # Import custom modules
+# Only the lightweight parsing/analytics modules are loaded up front.
+# utils.api_handler (and with it `requests`) is imported in step 6, when
+# the network enrichment is actually needed; --no-enrich skips it entirely.
 from utils.file_handler import read_sales_data, parse_transactions, validate_and_filter
 from utils.data_processor import (
     calculate_total_revenue, region_wise_sales, top_selling_products,
-    customer_analysis, daily_sales_trend, find_peak_sales_day,
+    customer_segmentation, daily_sales_trend, find_peak_sales_day,
     low_performing_products, generate_sales_report
 )
-from utils.api_handler import (
-    fetch_all_products, create_product_mapping,
-    enrich_sales_data, save_enriched_data
-)
+
+IMPORT_TIME_MS = (time.perf_counter() - _IMPORT_START) * 1000
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sales Analytics System")
+    parser.add_argument('--out-of-core', action='store_true',
+                        help="stream the data file instead of loading it (for files larger than memory)")
+    parser.add_argument('--no-enrich', action='store_true',
+                        help="skip the API enrichment steps (the API module and requests are never loaded)")
+    parser.add_argument('--keep-last', action='store_true',
+                        help="when a TransactionID repeats, keep the last copy instead of the first")
+    parser.add_argument('--id-index', metavar='PATH',
+                        help="persistent index of ingested TransactionIDs; IDs from earlier runs are skipped")
+    parser.add_argument('--max-records', type=int, metavar='N',
+                        help="with --out-of-core, records held in memory before spilling to disk (default: 500000)")
+    parser.add_argument('--tmp-dir', metavar='DIR',
+                        help="with --out-of-core, directory for spill files (default: the system temp directory)")
+    args = parser.parse_args()
+    if args.max_records is not None and args.max_records < 1:
+        parser.error("--max-records must be at least 1")
+    if args.tmp_dir is not None and not os.path.isdir(args.tmp_dir):
+        parser.error(f"--tmp-dir is not a directory: {args.tmp_dir}")
+    return args
+
+def record_ingested_ids(id_index, valid_data):
+    id_index.add(t['TransactionID'] for t in valid_data)
+    id_index.commit()
+    print(f"✓ TransactionID index updated: {id_index.path} ({len(id_index)} IDs)")
+
+def run_out_of_core(data_file, enriched_file, report_file, base_dir, keep='first', id_index=None,
+                    enrich=True, max_records=None, tmp_dir=None):
+    """
+    Streams the data file instead of loading it, spilling sorts and
+    aggregations to temp files in tmp_dir once they exceed max_records
+    (DEFAULT_MAX_RECORDS if not given). Produces the same report as main().
+    """
+    from utils.out_of_core import TransactionFile, DEFAULT_MAX_RECORDS
+
+    # 1. Open Sales Data
+    print("\n[1/4] Scanning sales data (out-of-core)...")
+    valid_data = TransactionFile(data_file, max_records=max_records or DEFAULT_MAX_RECORDS,
+                                 tmp_dir=tmp_dir, keep=keep, id_index=id_index)
+    try:
+        print(f"✓ Valid: {len(valid_data)} transactions (memory budget: {valid_data.max_records} records)")
+        print(f"✓ Duplicates removed: {valid_data.duplicate_count} | Already ingested: {valid_data.previously_ingested_count}")
+        if not len(valid_data):
+            print("No valid data found. Exiting.")
+            return
+
+        if enrich:
+            # 2. Fetch Product Data
+            print("\n[2/4] Fetching product data from API...")
+            from utils.api_handler import (
+                fetch_all_products, create_product_mapping,
+                iter_enriched_sales_data, save_enriched_data
+            )
+            api_products = fetch_all_products()
+            product_mapping = create_product_mapping(api_products)
+            print(f"✓ Fetched {len(api_products)} products")
+
+            # 3. Save Enriched Data (streamed, one transaction at a time)
+            print("\n[3/4] Enriching and saving data...")
+            save_enriched_data(iter_enriched_sales_data(valid_data, product_mapping), enriched_file)
+            print(f"✓ Saved to: {os.path.relpath(enriched_file, base_dir)}")
+            enriched_data = iter_enriched_sales_data(valid_data, product_mapping)
+        else:
+            print("\n[2/4] Skipping API enrichment (--no-enrich)")
+            print("\n[3/4] Skipping enriched data file (--no-enrich)")
+            enriched_data = []
+
+        # 4. Generate Report
+        print("\n[4/4] Generating report...")
+        generate_sales_report(valid_data, enriched_data, report_file, enrich=enrich)
+        print(f"✓ Report saved to: {os.path.relpath(report_file, base_dir)}")
+
+        if id_index is not None:
+            record_ingested_ids(id_index, valid_data)
+    finally:
+        valid_data.close()
 
 def main():
     print("===================")
     print("SALES ANALYTICS SYSTEM")
     print("===================")
+    print(f"Startup import time: {IMPORT_TIME_MS:.1f} ms")
+    
+    args = parse_args()
+    keep = 'last' if args.keep_last else 'first'
+    id_index = None
     
     try:
         # Define paths
@@ -25,6 +111,15 @@ def main():
         enriched_file = os.path.join(base_dir, 'data', 'enriched_sales_data.txt')
         report_file = os.path.join(base_dir, 'output', 'sales_report.txt')
 
+        if args.id_index:
+            from utils.id_index import TransactionIdIndex
+            id_index = TransactionIdIndex(args.id_index)
+
+        if args.out_of_core:
+            run_out_of_core(data_file, enriched_file, report_file, base_dir, keep=keep, id_index=id_index,
+                            enrich=not args.no_enrich, max_records=args.max_records, tmp_dir=args.tmp_dir)
+            return
+
         # 1. Read Sales Data
         print("\n[1/10] Reading sales data...")
         raw_lines = read_sales_data(data_file)
@@ -53,7 +148,7 @@ def main():
         
         # We need valid data to calculate stats for the prompt
         # So let's validate first without filters
-        temp_valid, _, temp_summary = validate_and_filter(parsed_data) 
+        temp_valid, _, temp_summary = validate_and_filter(parsed_data, keep=keep, id_index=id_index) 
         # validate_and_filter prints [Data Stats]... which meets the "Show available regions" requirement.
         
         filter_choice = input("\nDo you want to filter data? (y/n): ").strip().lower()
@@ -84,9 +179,10 @@ def main():
         # 4. Validate and Filter (Actual)
         print("\n[4/10] Validating transactions...")
         valid_data, invalid_count, summary = validate_and_filter(
-            parsed_data, region=region_filter, min_amount=min_amt, max_amount=max_amt
+            parsed_data, region=region_filter, min_amount=min_amt, max_amount=max_amt,
+            keep=keep, id_index=id_index
         )
-        print(f"✓ Valid: {len(valid_data)} | Invalid: {invalid_count}")
+        print(f"✓ Valid: {len(valid_data)} | Invalid: {invalid_count} | Duplicates: {summary['duplicates']}")
         
         if not valid_data:
             print("No valid data remaining after filtering. Aborting analysis.")
@@ -106,36 +202,50 @@ def main():
         _ = calculate_total_revenue(valid_data)
         _ = region_wise_sales(valid_data)
         _ = top_selling_products(valid_data)
-        _ = customer_analysis(valid_data)
+        _ = customer_segmentation(valid_data)
         _ = daily_sales_trend(valid_data)
         _ = find_peak_sales_day(valid_data)
         _ = low_performing_products(valid_data)
         print("✓ Analysis complete")
 
-        # 6. Fetch Product Data
-        print("\n[6/10] Fetching product data from API...")
-        api_products = fetch_all_products()
-        print(f"✓ Fetched {len(api_products)} products")
+        if args.no_enrich:
+            print("\n[6-8/10] Skipping API enrichment (--no-enrich)")
+            enriched_data = []
+        else:
+            # 6. Fetch Product Data
+            print("\n[6/10] Fetching product data from API...")
+            t0 = time.perf_counter()
+            from utils.api_handler import (
+                fetch_all_products, create_product_mapping,
+                enrich_sales_data, save_enriched_data
+            )
+            print(f"✓ API module loaded in {(time.perf_counter() - t0) * 1000:.1f} ms (not included in startup time)")
+            api_products = fetch_all_products()
+            print(f"✓ Fetched {len(api_products)} products")
 
-        # 7. Enrich Sales Data
-        print("\n[7/10] Enriching sales data...")
-        product_mapping = create_product_mapping(api_products)
-        enriched_data = enrich_sales_data(valid_data, product_mapping)
-        
-        enriched_count = sum(1 for t in enriched_data if t.get('API_Match'))
-        enrich_pct = (enriched_count / len(valid_data) * 100) if valid_data else 0
-        print(f"✓ Enriched {enriched_count}/{len(valid_data)} transactions ({enrich_pct:.1f}%)")
+            # 7. Enrich Sales Data
+            print("\n[7/10] Enriching sales data...")
+            product_mapping = create_product_mapping(api_products)
+            enriched_data = enrich_sales_data(valid_data, product_mapping)
+            
+            enriched_count = sum(1 for t in enriched_data if t.get('API_Match'))
+            enrich_pct = (enriched_count / len(valid_data) * 100) if valid_data else 0
+            print(f"✓ Enriched {enriched_count}/{len(valid_data)} transactions ({enrich_pct:.1f}%)")
 
-        # 8. Save Enriched Data
-        print("\n[8/10] Saving enriched data...")
-        save_enriched_data(enriched_data, enriched_file)
-        print(f"✓ Saved to: {os.path.relpath(enriched_file, base_dir)}")
+            # 8. Save Enriched Data
+            print("\n[8/10] Saving enriched data...")
+            save_enriched_data(enriched_data, enriched_file)
+            print(f"✓ Saved to: {os.path.relpath(enriched_file, base_dir)}")
 
         # 9. Generate Report
         print("\n[9/10] Generating report...")
-        generate_sales_report(valid_data, enriched_data, report_file)
+        generate_sales_report(valid_data, enriched_data, report_file, enrich=not args.no_enrich)
         print(f"✓ Report saved to: {os.path.relpath(report_file, base_dir)}")
 
+        # Only mark IDs as ingested once the report is written, so a failed run can be repeated
+        if id_index is not None:
+            record_ingested_ids(id_index, valid_data)
+
         # 10. Completion
         print("\n[10/10] Process Complete!")
         print("=========")
@@ -145,6 +255,9 @@ def main():
         import traceback
         traceback.print_exc()
         print("The program encountered an unexpected error and had to stop.")
+    finally:
+        if id_index is not None:
+            id_index.close()
 
 if __name__ == "__main__":
     main()
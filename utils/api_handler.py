@@ -1,4 +1,3 @@
-import requests
 import re
 import os
 
@@ -8,6 +7,14 @@ def fetch_all_products():
     Fetches all products from DummyJSON API.
     Returns: list of product dictionaries
     """
+    # Imported here so that runs which never hit the network don't pay
+    # for loading `requests` at startup.
+    try:
+        import requests
+    except ImportError:
+        print("Error fetching API data: 'requests' is not installed")
+        return []
+
     url = "https://dummyjson.com/products?limit=100"
     try:
         response = requests.get(url, timeout=10)
@@ -38,12 +45,11 @@ def create_product_mapping(api_products):
     return mapping
 
 # Task 3.2: Enrich Sales Data
-def enrich_sales_data(transactions, product_mapping):
+def iter_enriched_sales_data(transactions, product_mapping):
     """
-    Enriches transaction data with API product information.
+    Enriches transactions with API product information one at a time.
+    Use this instead of enrich_sales_data() for out-of-core sources.
     """
-    enriched_data = []
-    
     for t in transactions:
         # Create a copy to avoid mutating original list items in place unexpectedly
         enriched_t = t.copy()
@@ -68,9 +74,13 @@ def enrich_sales_data(transactions, product_mapping):
             enriched_t['API_Rating'] = None
             enriched_t['API_Match'] = False
             
-        enriched_data.append(enriched_t)
-        
-    return enriched_data
+        yield enriched_t
+
+def enrich_sales_data(transactions, product_mapping):
+    """
+    Enriches transaction data with API product information.
+    """
+    return list(iter_enriched_sales_data(transactions, product_mapping))
 
 # Task 3.2: Save Enriched Data
 def save_enriched_data(enriched_transactions, filename='data/enriched_sales_data.txt'):
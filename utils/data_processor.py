@@ -1,5 +1,24 @@
+import heapq
 import os
+from array import array
+from bisect import bisect_left, bisect_right
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
+
+# utils.out_of_core is only imported when a source carries a memory budget
+# (see _spill_options), so in-memory runs never pay for loading it.
+
+def _spill_options(records):
+    """
+    Reads the memory budget carried by a record source (see
+    utils.out_of_core.TransactionFile). Plain lists carry none.
+    Returns: dictionary with 'max_records' and 'tmp_dir'
+    """
+    return {
+        'max_records': getattr(records, 'max_records', None),
+        'tmp_dir': getattr(records, 'tmp_dir', None)
+    }
 
 # ==========================================
 # Task 2: Data Processing
@@ -74,49 +93,309 @@ def top_selling_products(transactions, n=5):
     return product_list[:n]
 
 # Task 2.1d: Customer Purchase Analysis
-def customer_analysis(transactions):
+def _group_customers(transactions, include_products=True):
+    """
+    Sort-based group-by over (CustomerID, Date).
+    Collects everything the customer-level analyses need in a single pass,
+    so customer metrics, RFM and cohorts don't each re-scan the data.
+    Out-of-core sources are hash-partitioned on CustomerID first, so only
+    one partition's customers are sorted and held in memory at a time.
+    Yields: per-customer dictionaries
+    """
+    options = _spill_options(transactions)
+    if options['max_records'] is None:
+        parts = [transactions if isinstance(transactions, list) else list(transactions)]
+    else:
+        from utils.out_of_core import partition_records
+        parts = partition_records(transactions, itemgetter('CustomerID'), **options)
+
+    for part in parts:
+        # sorted() rather than .sort(): an in-memory partition is the caller's own list
+        ordered = sorted(part, key=itemgetter('CustomerID', 'Date'))
+
+        for c_id, rows in groupby(ordered, key=itemgetter('CustomerID')):
+            total_spent = 0.0
+            purchase_count = 0
+            first_date = None
+            last_date = None
+            months = []  # distinct active months as (year * 12 + month), ascending
+            products = set() if include_products else None
+
+            for t in rows:
+                total_spent += t['Quantity'] * t['UnitPrice']
+                purchase_count += 1
+                date = t['Date']
+                if first_date is None:
+                    first_date = date
+                last_date = date
+
+                try:
+                    month = int(date[:4]) * 12 + int(date[5:7]) - 1
+                except ValueError:
+                    month = None
+                # Rows arrive date-ordered, so a month only needs comparing to the previous one
+                if month is not None and (not months or months[-1] != month):
+                    months.append(month)
+
+                if products is not None:
+                    products.add(t['ProductName'])
+
+            yield {
+                'customer_id': c_id,
+                'total_spent': total_spent,
+                'purchase_count': purchase_count,
+                'first_date': first_date,
+                'last_date': last_date,
+                'months': months,
+                'products': products
+            }
+
+def _customers_from_groups(groups):
+    final_stats = {}
+    # Ties are ordered by CustomerID, the same in memory and out of core
+    sorted_groups = sorted(groups, key=lambda g: (-g['total_spent'], g['customer_id']))
+
+    for g in sorted_groups:
+        stats = {
+            'total_spent': g['total_spent'],
+            'purchase_count': g['purchase_count'],
+            'avg_order_value': round(g['total_spent'] / g['purchase_count'], 2)
+        }
+        if g['products'] is not None:
+            stats['products_bought'] = list(g['products'])
+        final_stats[g['customer_id']] = stats
+
+    return final_stats
+
+def customer_analysis(transactions, include_products=True):
     """
     Analyzes customer purchase patterns.
+    Set include_products=False to skip building the per-customer product lists.
     Returns: dictionary of customer statistics
     """
-    customer_stats = {}
-    
-    for t in transactions:
-        c_id = t['CustomerID']
-        amount = t['Quantity'] * t['UnitPrice']
-        product = t['ProductName']
-        
-        if c_id not in customer_stats:
-            customer_stats[c_id] = {
-                'total_spent': 0.0,
-                'purchase_count': 0,
-                'products_bought': set()
-            }
-            
-        customer_stats[c_id]['total_spent'] += amount
-        customer_stats[c_id]['purchase_count'] += 1
-        customer_stats[c_id]['products_bought'].add(product)
-        
-    # Finalize stats (avg value, list conversion)
+    return _customers_from_groups(_group_customers(transactions, include_products))
+
+# Task 2.1e: RFM Segmentation
+def _quintile_scores(values):
+    """
+    Scores each value 1-5 by its rank among all values (5 = highest).
+    Ties are ranked at the middle of their tie group, so a single value
+    or a set of identical values scores 3.
+    """
+    ordered = sorted(values)
+    n = len(ordered)
+    # (lo + hi) / 2n is the mid-rank percentile, always in (0, 1)
+    return [(bisect_left(ordered, v) + bisect_right(ordered, v)) * 5 // (2 * n) + 1
+            for v in values]
+
+def _rfm_segment(r, f, m):
+    if r >= 4 and f >= 4:
+        return 'Champions'
+    if f >= 4:
+        return 'Loyal'
+    if r >= 4 and f <= 2:
+        return 'New'
+    if r <= 2 and (f >= 3 or m >= 4):
+        return 'At Risk'
+    if r <= 2:
+        return 'Lost'
+    return 'Regular'
+
+def _new_rfm_inputs(keep_ids=True):
+    # Compact typed arrays, so even millions of customers stay small
+    return {
+        'ids': [] if keep_ids else None,
+        'last_day': array('l'),
+        'frequency': array('l'),
+        'monetary': array('d')
+    }
+
+def _add_rfm_input(inputs, g):
+    try:
+        last_day = datetime.strptime(g['last_date'], '%Y-%m-%d').toordinal()
+    except (TypeError, ValueError):
+        return
+    if inputs['ids'] is not None:
+        inputs['ids'].append(g['customer_id'])
+    inputs['last_day'].append(last_day)
+    inputs['frequency'].append(g['purchase_count'])
+    inputs['monetary'].append(g['total_spent'])
+
+def _score_rfm(inputs, as_of=None):
+    """
+    Yields: tuple (index, recency_days, r_score, f_score, m_score) per customer
+    """
+    last_days = inputs['last_day']
+    if not last_days:
+        return
+
+    if as_of is None:
+        as_of_day = max(last_days)
+    else:
+        as_of_day = datetime.strptime(as_of, '%Y-%m-%d').toordinal()
+
+    # Fewer days since the last purchase is better, so score on the last purchase day
+    r_scores = _quintile_scores(last_days)
+    f_scores = _quintile_scores(inputs['frequency'])
+    m_scores = _quintile_scores(inputs['monetary'])
+
+    for i, last_day in enumerate(last_days):
+        yield i, as_of_day - last_day, r_scores[i], f_scores[i], m_scores[i]
+
+def _rfm_from_groups(groups, as_of=None):
+    inputs = _new_rfm_inputs()
+    for g in groups:
+        _add_rfm_input(inputs, g)
+
+    rfm = {}
+    for i, recency, r, f, m in _score_rfm(inputs, as_of):
+        rfm[inputs['ids'][i]] = {
+            'recency_days': recency,
+            'frequency': inputs['frequency'][i],
+            'monetary': inputs['monetary'][i],
+            'r_score': r,
+            'f_score': f,
+            'm_score': m,
+            'rfm_score': f"{r}{f}{m}",
+            'segment': _rfm_segment(r, f, m)
+        }
+
+    return rfm
+
+def rfm_analysis(transactions, as_of=None):
+    """
+    Scores customers on Recency, Frequency and Monetary value (1-5 each).
+    as_of: 'YYYY-MM-DD' reference date, defaults to the latest purchase date.
+    Returns: dictionary of customer RFM statistics
+    """
+    return _rfm_from_groups(_group_customers(transactions, include_products=False), as_of)
+
+# Task 2.1f: Cohort Retention
+def _add_to_cohorts(cohort_active, months):
+    if not months:
+        return
+    first = months[0]
+    active = cohort_active.setdefault(first, [])
+    for month in months:
+        offset = month - first
+        if offset >= len(active):
+            active.extend([0] * (offset + 1 - len(active)))
+        active[offset] += 1
+
+def _finalize_cohorts(cohort_active):
+    cohorts = {}
+    for first in sorted(cohort_active):
+        active = cohort_active[first]
+        size = active[0]
+        label = f"{first // 12:04d}-{first % 12 + 1:02d}"
+        cohorts[label] = {
+            'customers': size,
+            'active': active,
+            'retention': [round(count / size * 100, 2) for count in active]
+        }
+
+    return cohorts
+
+def _cohorts_from_groups(groups):
+    cohort_active = {}
+    for g in groups:
+        _add_to_cohorts(cohort_active, g['months'])
+    return _finalize_cohorts(cohort_active)
+
+def cohort_retention(transactions):
+    """
+    Groups customers into monthly cohorts by first purchase month.
+    Returns: dictionary sorted by cohort month, with active customer counts
+             and retention % for each month since the first purchase
+    """
+    return _cohorts_from_groups(_group_customers(transactions, include_products=False))
+
+def customer_segmentation(transactions, as_of=None, include_products=False):
+    """
+    Computes customer metrics, RFM scores and cohort retention in one pass.
+    Returns: dictionary with 'customers', 'rfm' and 'cohorts'
+    """
+    groups = list(_group_customers(transactions, include_products))
+    return {
+        'customers': _customers_from_groups(groups),
+        'rfm': _rfm_from_groups(groups, as_of),
+        'cohorts': _cohorts_from_groups(groups)
+    }
+
+def _customer_report_stats(transactions, top_n=5, as_of=None):
+    """
+    Streams customer groups once and keeps only what the report prints:
+    top customers, RFM segment totals and cohorts. Per-customer state is
+    reduced to the compact RFM arrays, so this scales to files of any size.
+    Returns: tuple (top customers as (CustomerID, total_spent, purchase_count),
+                    segment dict of [customers, revenue], cohorts)
+    """
+    top = []
+    # Ties on CustomerID, so in-memory and out-of-core runs print the same report
+    top_key = lambda c: (-c[1], c[0])
+    cohort_active = {}
+    inputs = _new_rfm_inputs(keep_ids=False)
+
+    for g in _group_customers(transactions, include_products=False):
+        top.append((g['customer_id'], g['total_spent'], g['purchase_count']))
+        if len(top) > top_n * 100:
+            top.sort(key=top_key)
+            del top[top_n:]
+        _add_to_cohorts(cohort_active, g['months'])
+        _add_rfm_input(inputs, g)
+
+    top.sort(key=top_key)
+    del top[top_n:]
+
+    segment_stats = {}
+    for i, _, r, f, m in _score_rfm(inputs, as_of):
+        seg = segment_stats.setdefault(_rfm_segment(r, f, m), [0, 0.0])
+        seg[0] += 1
+        seg[1] += inputs['monetary'][i]
+
+    return top, segment_stats, _finalize_cohorts(cohort_active)
+
+# Task 2.2a: Daily Sales Trend
+def _daily_sales_trend_sorted(transactions, options):
+    """
+    Out-of-core variant: external sort on (Date, CustomerID), then stream,
+    so unique customers are counted without keeping a set per day.
+    """
+    from utils.out_of_core import sort_records
+
     final_stats = {}
-    sorted_customers = sorted(customer_stats.items(), key=lambda x: x[1]['total_spent'], reverse=True)
+    ordered = sort_records(transactions, itemgetter('Date', 'CustomerID'), **options)
     
-    for c_id, stats in sorted_customers:
-        final_stats[c_id] = {
-            'total_spent': stats['total_spent'],
-            'purchase_count': stats['purchase_count'],
-            'avg_order_value': round(stats['total_spent'] / stats['purchase_count'], 2),
-            'products_bought': list(stats['products_bought'])
+    for date, rows in groupby(ordered, key=itemgetter('Date')):
+        revenue = 0.0
+        transaction_count = 0
+        unique_customers = 0
+        prev_customer = None
+        
+        for t in rows:
+            revenue += t['Quantity'] * t['UnitPrice']
+            transaction_count += 1
+            if t['CustomerID'] != prev_customer:
+                unique_customers += 1
+                prev_customer = t['CustomerID']
+                
+        final_stats[date] = {
+            'revenue': revenue,
+            'transaction_count': transaction_count,
+            'unique_customers': unique_customers
         }
         
     return final_stats
 
-# Task 2.2a: Daily Sales Trend
 def daily_sales_trend(transactions):
     """
     Analyzes sales trends by date.
     Returns: dictionary sorted by date
     """
+    options = _spill_options(transactions)
+    if options['max_records'] is not None:
+        return _daily_sales_trend_sorted(transactions, options)
+    
     daily_stats = {}
     
     for t in transactions:
@@ -155,7 +434,13 @@ def find_peak_sales_day(transactions):
     Identifies the date with highest revenue.
     Returns: tuple (date, revenue, transaction_count)
     """
-    trends = daily_sales_trend(transactions)
+    return _peak_day(daily_sales_trend(transactions))
+
+def _peak_day(trends):
+    """
+    Picks the highest-revenue day from daily_sales_trend() output.
+    Returns: tuple (date, revenue, transaction_count)
+    """
     if not trends:
         return (None, 0.0, 0)
         
@@ -178,38 +463,192 @@ def low_performing_products(transactions, threshold=10):
     
     return low_performers
 
+# Task 2.3b: Product Co-occurrence (Market Basket)
+def _encode_baskets(transactions, basket='customer'):
+    """
+    Integer-encodes products and groups them into baskets.
+    basket='customer' -> all products a customer bought
+    basket='day'      -> products a customer bought on the same day
+    Returns: tuple (baskets as sorted tuples of product codes, code -> ProductName list);
+             baskets is a list, or a SpillList for out-of-core sources
+    """
+    if basket == 'customer':
+        key = itemgetter('CustomerID')
+    elif basket == 'day':
+        key = itemgetter('CustomerID', 'Date')
+    else:
+        raise ValueError(f"Unknown basket type: {basket}")
+
+    codes = {}
+    names = []
+    options = _spill_options(transactions)
+    if options['max_records'] is None:
+        baskets = []
+        ordered = sorted(transactions, key=key)
+    else:
+        from utils.out_of_core import sort_records, SpillList
+        baskets = SpillList(**options)
+        ordered = sort_records(transactions, key, **options)
+
+    for _, rows in groupby(ordered, key=key):
+        items = set()
+        for t in rows:
+            p_id = t['ProductID']
+            code = codes.get(p_id)
+            if code is None:
+                code = codes[p_id] = len(names)
+                names.append(t['ProductName'])
+            items.add(code)
+        baskets.append(tuple(sorted(items)))
+
+    return baskets, names
+
+def product_cooccurrence(transactions, basket='customer', min_support=2, max_pairs=100000, top_n=10):
+    """
+    Finds products that are frequently bought together.
+    Products are counted on integer codes in a sparse pair counter. Products
+    bought in fewer than min_support baskets are pruned before any pairs
+    are generated. Counts are exact: the counter never holds more than
+    max_pairs entries, and when it fills up its partial counts are spilled
+    to temp files, hash-partitioned on the pair and summed one partition
+    at a time (utils.out_of_core is only loaded in that case).
+    Returns: list of tuples (ProductA, ProductB, PairCount, Support%),
+             ties ordered by product code
+    """
+    baskets, names = _encode_baskets(transactions, basket)
+    try:
+        return _count_pairs(baskets, names, min_support, max_pairs, top_n,
+                            _spill_options(transactions)['tmp_dir'])
+    finally:
+        if not isinstance(baskets, list):
+            baskets.close()
+
+def _count_pairs(baskets, names, min_support, max_pairs, top_n, tmp_dir=None):
+    if not baskets:
+        return []
+
+    # Pass 1: single-product support, so infrequent products never form pairs
+    item_counts = [0] * len(names)
+    for items in baskets:
+        for code in items:
+            item_counts[code] += 1
+    frequent = [count >= min_support for count in item_counts]
+
+    # Pass 2: sparse pair counts keyed on a single int (a * n + b, a < b)
+    n = len(names)
+    pair_counts = {}
+    spilled = None
+    for items in baskets:
+        items = [code for code in items if frequent[code]]
+        for i in range(len(items) - 1):
+            a = items[i] * n
+            for b in items[i + 1:]:
+                pair = a + b
+                if pair in pair_counts:
+                    pair_counts[pair] += 1
+                else:
+                    pair_counts[pair] = 1
+                    # Checked per new pair, so even one huge basket can't overrun the budget
+                    if len(pair_counts) >= max_pairs:
+                        if spilled is None:
+                            from utils.out_of_core import SpillList
+                            # Budget 0: written to disk batch by batch, so at
+                            # most max_pairs counts are ever held in memory
+                            spilled = SpillList(0, tmp_dir)
+                        for item in pair_counts.items():
+                            spilled.append(item)
+                        pair_counts = {}
+
+    if spilled is None:
+        totals = [pair_counts.items()]
+    else:
+        for item in pair_counts.items():
+            spilled.append(item)
+        pair_counts = {}
+        totals = _merge_spilled_pairs(spilled, max_pairs, tmp_dir)
+
+    try:
+        candidates = (
+            (-count, pair)
+            for part in totals
+            for pair, count in part
+            if count >= min_support
+        )
+        if top_n is None:
+            top = sorted(candidates)
+        else:
+            top = heapq.nsmallest(top_n, candidates)
+    finally:
+        if spilled is not None:
+            spilled.close()
+
+    total_baskets = len(baskets)
+    return [
+        (names[pair // n], names[pair % n], -neg_count, round(-neg_count / total_baskets * 100, 2))
+        for neg_count, pair in top
+    ]
+
+def _merge_spilled_pairs(spilled, max_pairs, tmp_dir):
+    """
+    Sums spilled partial pair counts. All partials of a pair land in the
+    same hash partition, so each partition's totals are exact.
+    Yields: (pair, count) items, one partition at a time
+    """
+    from utils.out_of_core import partition_records
+
+    for part in partition_records(spilled, itemgetter(0), max_pairs, tmp_dir):
+        merged = {}
+        for pair, count in part:
+            merged[pair] = merged.get(pair, 0) + count
+        yield merged.items()
+
 # ==========================================
 # Task 4: Report Generation
 # ==========================================
 
-def generate_sales_report(transactions, enriched_transactions, output_file='output/sales_report.txt'):
+def generate_sales_report(transactions, enriched_transactions, output_file='output/sales_report.txt',
+                          enrich=True):
     """
     Generates a comprehensive formatted text report.
+    transactions may be a list or an out-of-core source such as
+    utils.out_of_core.TransactionFile; enriched_transactions may be any
+    iterable (it is read once). Both give the same report.
+    Pass enrich=False when enrichment was skipped, so the API section says
+    so instead of reporting a 0% success rate.
     """
     # Calculate all stats
     total_revenue = calculate_total_revenue(transactions)
     total_txns = len(transactions)
     avg_order_val = total_revenue / total_txns if total_txns > 0 else 0
     
-    dates = sorted([t['Date'] for t in transactions])
-    date_range = f"{dates[0]} to {dates[-1]}" if dates else "N/A"
-    
     region_stats = region_wise_sales(transactions)
     top_products = top_selling_products(transactions, n=5)
-    customer_stats = customer_analysis(transactions)
+    top_customers, segment_stats, cohorts = _customer_report_stats(transactions, top_n=5)
     daily_trends = daily_sales_trend(transactions)
     
-    peak_day = find_peak_sales_day(transactions)
+    # daily_trends is already in date order, so it gives the date range and peak day too
+    dates = list(daily_trends)
+    date_range = f"{dates[0]} to {dates[-1]}" if dates else "N/A"
+    peak_day = _peak_day(daily_trends)
     low_products = low_performing_products(transactions, threshold=5) # Example threshold
+    customer_pairs = product_cooccurrence(transactions, basket='customer', top_n=5)
+    daily_pairs = product_cooccurrence(transactions, basket='day', top_n=5)
     
     # API Enrichment Stats
     # Assuming 'API_Match' might be in enriched_transactions
     # If enriched_transactions is passed, calculate stats from it
     # If not, use empty defaults
-    total_enriched = len(enriched_transactions)
-    successful_enrichment = sum(1 for t in enriched_transactions if t.get('API_Match') is True)
+    total_enriched = 0
+    successful_enrichment = 0
+    missing_products = set()
+    for t in enriched_transactions:
+        total_enriched += 1
+        if t.get('API_Match') is True:
+            successful_enrichment += 1
+        elif t.get('API_Match') is False:
+            missing_products.add(t['ProductName'])
     success_rate = (successful_enrichment / total_enriched * 100) if total_enriched > 0 else 0.0
-    missing_products = list(set(t['ProductName'] for t in enriched_transactions if t.get('API_Match') is False))
+    missing_products = list(missing_products)
 
     # Ensure output directory exists
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
@@ -252,14 +691,26 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
         f.write("TOP 5 CUSTOMERS\n")
         f.write("--------------------------------------------------\n")
         f.write(f"{'Rank':<5} {'Customer ID':<15} {'Total Spent':<15} {'Orders':<10}\n")
-        # customer_analysis returns dict, simpler to re-sort list of (id, stats)
-        # It's already sorted in the function but returned as dict. 
-        # Dicts preserve insertion order in modern python, but let's be safe.
-        # WAIT: the function `customer_analysis` returns a dict where keys are IDs.
-        # I need to re-sort here or trust insertion order. Let's re-sort to be safe.
-        sorted_cust_list = sorted(customer_stats.items(), key=lambda x: x[1]['total_spent'], reverse=True)[:5]
-        for i, (c_id, stats) in enumerate(sorted_cust_list, 1):
-            f.write(f"{i:<5} {c_id:<15} ${stats['total_spent']:<14,.2f} {stats['purchase_count']:<10}\n")
+        # _customer_report_stats keeps just the top 5, already sorted by total spent
+        for i, (c_id, total_spent, purchase_count) in enumerate(top_customers, 1):
+            f.write(f"{i:<5} {c_id:<15} ${total_spent:<14,.2f} {purchase_count:<10}\n")
+        f.write("\n")
+        
+        # 5a. CUSTOMER SEGMENTATION (RFM)
+        f.write("CUSTOMER SEGMENTATION (RFM)\n")
+        f.write("--------------------------------------------------\n")
+        f.write(f"{'Segment':<15} {'Customers':<10} {'Revenue':<15}\n")
+        for segment, (count, revenue) in sorted(segment_stats.items(), key=lambda x: x[1][1], reverse=True):
+            f.write(f"{segment:<15} {count:<10} ${revenue:<14,.2f}\n")
+        f.write("\n")
+        
+        # 5b. COHORT RETENTION
+        f.write("COHORT RETENTION (% active by month since first purchase)\n")
+        f.write("--------------------------------------------------\n")
+        max_offset = max((len(c['retention']) for c in cohorts.values()), default=0)
+        f.write(f"{'Cohort':<10} {'Size':<6}" + "".join(f" {'M' + str(i):<8}" for i in range(max_offset)) + "\n")
+        for cohort, stats in cohorts.items():
+            f.write(f"{cohort:<10} {stats['customers']:<6}" + "".join(f" {f'{pct:.1f}%':<8}" for pct in stats['retention']) + "\n")
         f.write("\n")
         
         # 6. DAILY SALES TREND
@@ -286,13 +737,28 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
             f.write("  None\n")
         f.write("\n")
             
+        # 7a. FREQUENTLY BOUGHT TOGETHER
+        f.write("FREQUENTLY BOUGHT TOGETHER\n")
+        f.write("--------------------------------------------------\n")
+        for title, pairs in (("Same Customer", customer_pairs), ("Same Customer, Same Day", daily_pairs)):
+            f.write(f"{title}:\n")
+            if pairs:
+                for a, b, count, support in pairs:
+                    f.write(f"  - {a} + {b}: {count} baskets ({support:.2f}%)\n")
+            else:
+                f.write("  None\n")
+        f.write("\n")
+            
         # 8. API ENRICHMENT SUMMARY
         f.write("API ENRICHMENT SUMMARY\n")
         f.write("--------------------------------------------------\n")
-        f.write(f"Total Products Processed:       {total_enriched}\n")
-        f.write(f"Successfully Enriched:          {successful_enrichment}\n")
-        f.write(f"Enrichment Success Rate:        {success_rate:.2f}%\n")
-        if missing_products:
+        if not enrich:
+            f.write("Skipped (run with --no-enrich)\n")
+        else:
+            f.write(f"Total Products Processed:       {total_enriched}\n")
+            f.write(f"Successfully Enriched:          {successful_enrichment}\n")
+            f.write(f"Enrichment Success Rate:        {success_rate:.2f}%\n")
+        if enrich and missing_products:
             f.write("Products not enriched (Sample): " + ", ".join(missing_products[:5]) + ("..." if len(missing_products)>5 else "") + "\n")
         
     print(f"Report generated successfully to: {output_file}")
@@ -38,7 +38,112 @@ def read_sales_data(filename):
         
     return non_empty_lines
 
+# Task 1.1b streaming reader for files that don't fit in memory
+def detect_encoding(filename):
+    """
+    Finds the first encoding that decodes the whole file, streaming it so
+    a bad byte near the end can't switch encodings halfway through a read.
+    
+    Args:
+        filename (str): Path to the file.
+        
+    Returns:
+        str: Encoding name, or None if the file is missing or undecodable.
+    """
+    if not os.path.exists(filename):
+        print(f"Error: File not found at {filename}")
+        return None
+
+    encodings = ['utf-8', 'latin-1', 'cp1252']
+    
+    for enc in encodings:
+        try:
+            with open(filename, 'r', encoding=enc) as f:
+                for _ in f:
+                    pass
+            return enc
+        except UnicodeDecodeError:
+            continue
+
+    print(f"Error: Could not decode file with any of the attempted encodings: {encodings}")
+    return None
+
+def iter_sales_data(filename, encoding=None):
+    """
+    Streams sales data lines from file without loading it all at once.
+    Same cleaning as read_sales_data(): stripped, non-empty, header skipped.
+    
+    Args:
+        filename (str): Path to the file.
+        encoding (str): Encoding from detect_encoding(). If omitted it is
+            detected first, which costs an extra read of the file.
+        
+    Yields:
+        str: Raw lines.
+    """
+    if encoding is None:
+        encoding = detect_encoding(filename)
+        if encoding is None:
+            return
+
+    with open(filename, 'r', encoding=encoding) as f:
+        first = True
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if first:
+                first = False
+                if "TransactionID" in line:
+                    continue
+            yield line
+
 # Task 1.2
+def _parse_line(line):
+    """
+    Parses a single raw line into a clean dictionary.
+    Returns: dict, or None if the line is malformed
+    """
+    parts = line.split('|')
+    
+    # Skip rows with incorrect number of fields
+    # Expecting 8 fields based on sample
+    if len(parts) < 8:
+        return None
+        
+    # Extract fields
+    # T001 | 2024-12-01 | P101 | Laptop|2|45000|C001| North
+    t_id = parts[0].strip()
+    date = parts[1].strip()
+    p_id = parts[2].strip()
+    p_name = parts[3].strip()
+    qty_str = parts[4].strip()
+    price_str = parts[5].strip()
+    c_id = parts[6].strip()
+    region = parts[7].strip()
+    
+    # Handle commas in ProductName (remove or replace)
+    p_name = p_name.replace(',', '')
+    
+    # Handle commas in numeric fields
+    try:
+        qty = int(qty_str.replace(',', ''))
+        price = float(price_str.replace(',', ''))
+    except ValueError:
+        # If conversion fails, valid data types requirement not met, validness depends on "Expected Valid records".
+        return None
+    #Creates a clean key-value dictionary for the row.
+    return {
+        'TransactionID': t_id,
+        'Date': date,
+        'ProductID': p_id,
+        'ProductName': p_name,
+        'Quantity': qty,
+        'UnitPrice': price,
+        'CustomerID': c_id,
+        'Region': region
+    }
+
 def parse_transactions(raw_lines):
     """
     Parses raw lines into clean list of dictionaries.
@@ -46,54 +151,88 @@ def parse_transactions(raw_lines):
     parsed_data = []
     
     for line in raw_lines:
-        parts = line.split('|')
-        
-        # Skip rows with incorrect number of fields
-        # Expecting 8 fields based on sample
-        if len(parts) < 8:
-            continue
-            
-        # Extract fields
-        # T001 | 2024-12-01 | P101 | Laptop|2|45000|C001| North
-        t_id = parts[0].strip()
-        date = parts[1].strip()
-        p_id = parts[2].strip()
-        p_name = parts[3].strip()
-        qty_str = parts[4].strip()
-        price_str = parts[5].strip()
-        c_id = parts[6].strip()
-        region = parts[7].strip()
-        
-        # Handle commas in ProductName (remove or replace)
-        p_name = p_name.replace(',', '')
-        
-        # Handle commas in numeric fields
-        try:
-            qty = int(qty_str.replace(',', ''))
-            price = float(price_str.replace(',', ''))
-        except ValueError:
-            # If conversion fails, valid data types requirement not met, validness depends on "Expected Valid records".
-                    continue
-        #Creates a clean key-value dictionary for the row and adds it to the main list.    
-        record = {
-            'TransactionID': t_id,
-            'Date': date,
-            'ProductID': p_id,
-            'ProductName': p_name,
-            'Quantity': qty,
-            'UnitPrice': price,
-            'CustomerID': c_id,
-            'Region': region
-        }
-        parsed_data.append(record)
+        record = _parse_line(line)
+        if record is not None:
+            parsed_data.append(record)
         
     return parsed_data 
     
 
 # Task 1.3
-def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None):
+def _is_valid(t):
+    """
+    Checks a parsed transaction against the validation rules.
+    Returns: bool
+    """
+    # Rules
+    # Quantity must be > 0
+    if t['Quantity'] <= 0:
+        return False
+    # UnitPrice must be > 0
+    if t['UnitPrice'] <= 0:
+        return False
+    # All required fields must be present 
+    # Let's check string fields for emptiness
+    if not t['TransactionID'] or not t['Date'] or not t['ProductID'] or not t['ProductName'] or not t['CustomerID'] or not t['Region']:
+        return False
+    # TransactionID must start with 'T'
+    if not t['TransactionID'].startswith('T'):
+        return False
+    # ProductID must start with 'P'
+    if not t['ProductID'].startswith('P'):
+        return False
+    # CustomerID must start with 'C'
+    if not t['CustomerID'].startswith('C'):
+        return False
+    return True
+
+# Task 1.4 Deduplication on TransactionID
+def deduplicate_transactions(transactions, keep='first', id_index=None):
+    """
+    Removes transactions whose TransactionID appears more than once.
+    
+    Args:
+        transactions (list): Parsed transactions.
+        keep (str): 'first' keeps the earliest copy of each ID, 'last' the latest.
+        id_index (TransactionIdIndex): Optional index of IDs ingested by earlier
+            runs; transactions with those IDs are dropped too.
+        
+    Returns:
+        tuple: (unique_transactions, duplicate_count, previously_ingested_count)
     """
-    Validates transactions and applies optional filters.
+    if keep not in ('first', 'last'):
+        raise ValueError(f"keep must be 'first' or 'last', not {keep!r}")
+
+    seen = set()
+    unique = []
+    
+    # For 'last', walk backwards so the first copy we see is the latest one
+    for t in (transactions if keep == 'first' else reversed(transactions)):
+        t_id = t['TransactionID']
+        if t_id in seen:
+            continue
+        seen.add(t_id)
+        unique.append(t)
+        
+    if keep == 'last':
+        unique.reverse()
+    duplicate_count = len(transactions) - len(unique)
+    
+    previously_ingested_count = 0
+    if id_index is not None:
+        existing = id_index.find_existing(seen)
+        if existing:
+            before = len(unique)
+            unique = [t for t in unique if t['TransactionID'] not in existing]
+            previously_ingested_count = before - len(unique)
+            
+    return unique, duplicate_count, previously_ingested_count
+
+def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None,
+                        deduplicate=True, keep='first', id_index=None):
+    """
+    Validates transactions, drops duplicate TransactionIDs and applies optional filters.
+    keep and id_index are passed on to deduplicate_transactions().
     
     Returns: tuple (valid_transactions, invalid_count, filter_summary)
     """
@@ -102,34 +241,20 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
     
     # 1. Validation Logic
     for t in transactions:
-        is_valid = True
-        
-        # Rules
-        # Quantity must be > 0
-        if t['Quantity'] <= 0:
-            is_valid = False
-        # UnitPrice must be > 0
-        elif t['UnitPrice'] <= 0:
-            is_valid = False
-        # All required fields must be present 
-        # Let's check string fields for emptiness
-        elif not t['TransactionID'] or not t['Date'] or not t['ProductID'] or not t['ProductName'] or not t['CustomerID'] or not t['Region']:
-            is_valid = False
-        # TransactionID must start with 'T'
-        elif not t['TransactionID'].startswith('T'):
-            is_valid = False
-        # ProductID must start with 'P'
-        elif not t['ProductID'].startswith('P'):
-            is_valid = False
-        # CustomerID must start with 'C'
-        elif not t['CustomerID'].startswith('C'):
-            is_valid = False
-            
-        if is_valid:
+        if _is_valid(t):
             valid_transactions.append(t)
         else:
             invalid_count += 1
             
+    # Duplicates are resolved among valid records only, so a corrupt copy
+    # can never win over a good one
+    duplicate_count = 0
+    previously_ingested_count = 0
+    if deduplicate:
+        valid_transactions, duplicate_count, previously_ingested_count = deduplicate_transactions(
+            valid_transactions, keep=keep, id_index=id_index
+        )
+            
     # 2. Collect Info for Filter Display
     unique_regions = sorted(list(set(t['Region'] for t in valid_transactions)))
     
@@ -145,6 +270,10 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
     print(f"\n[Data Stats]")
     print(f"Available Regions: {unique_regions}")
     print(f"Transaction Amount Range: ${global_min:,.2f} - ${global_max:,.2f}")
+    if deduplicate:
+        print(f"Duplicate TransactionIDs Removed: {duplicate_count}")
+        if id_index is not None:
+            print(f"Already Ingested (Skipped): {previously_ingested_count}")
     
     # 3. Filtering
     filtered_transactions = []
@@ -177,6 +306,8 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
     summary = {
         'total_input': len(transactions),
         'invalid': invalid_count,
+        'duplicates': duplicate_count,
+        'previously_ingested': previously_ingested_count,
         'filtered_by_region': filtered_by_region_count,
         'filtered_by_amount': filtered_by_amount_count,
         'final_count': len(filtered_transactions)
@@ -0,0 +1,73 @@
+import os
+import sqlite3
+
+# ==========================================
+# Persistent TransactionID index for incremental runs
+# ==========================================
+
+# IDs looked up per query (stays below SQLite's bound-parameter limit)
+LOOKUP_BATCH_SIZE = 500
+
+class TransactionIdIndex:
+    """
+    On-disk set of the TransactionIDs ingested by earlier runs, backed by
+    SQLite so it doesn't have to fit in memory. Lookups are exact, so unlike
+    a Bloom filter it never drops a new transaction by mistake.
+    IDs added during a run are only persisted by commit(); if a run fails
+    before that, re-running it ingests the same data again.
+    """
+
+    def __init__(self, path):
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS transaction_ids (id TEXT PRIMARY KEY) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def find_existing(self, ids):
+        """
+        Looks up a batch of IDs in one query per LOOKUP_BATCH_SIZE IDs.
+        Returns: set of the given IDs that are already in the index
+        """
+        ids = list(ids)
+        found = set()
+        for i in range(0, len(ids), LOOKUP_BATCH_SIZE):
+            batch = ids[i:i + LOOKUP_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            rows = self._conn.execute(
+                f"SELECT id FROM transaction_ids WHERE id IN ({placeholders})", batch
+            )
+            found.update(row[0] for row in rows)
+        return found
+
+    def __contains__(self, t_id):
+        return bool(self.find_existing([t_id]))
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM transaction_ids").fetchone()[0]
+
+    def add(self, ids):
+        """
+        Stages IDs to be recorded as ingested. Call commit() to persist them.
+        """
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO transaction_ids (id) VALUES (?)", ((t_id,) for t_id in ids)
+        )
+
+    def commit(self):
+        self._conn.commit()
+
+    def close(self):
+        # Anything added but not committed is discarded
+        self._conn.rollback()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
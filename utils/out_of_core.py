@@ -0,0 +1,341 @@
+import heapq
+import os
+import pickle
+import tempfile
+from itertools import groupby, islice
+from operator import itemgetter
+
+from utils.file_handler import detect_encoding, iter_sales_data, _parse_line, _is_valid
+
+# ==========================================
+# Out-of-core helpers for datasets larger than RAM
+# ==========================================
+
+# Default memory budget, in records held in memory at once
+DEFAULT_MAX_RECORDS = 500000
+
+# Records are pickled in batches; one pickle per record is much slower
+SPILL_BATCH_SIZE = 1000
+
+# Maximum number of sorted runs merged at once (bounds open file handles)
+MAX_MERGE_FANIN = 64
+
+# Hash partitions created each time aggregation state has to spill
+NUM_PARTITIONS = 16
+
+# How often an oversized partition is re-split with a new hash salt
+MAX_PARTITION_DEPTH = 3
+
+# TransactionIDs checked against the persistent index per lookup
+INDEX_LOOKUP_BATCH = 5000
+
+def _write_spill(records, path):
+    """
+    Writes records to a temp file in pickled batches.
+    Returns: number of records written
+    """
+    count = 0
+    with open(path, 'wb') as f:
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= SPILL_BATCH_SIZE:
+                pickle.dump(batch, f, protocol=pickle.HIGHEST_PROTOCOL)
+                count += len(batch)
+                batch = []
+        if batch:
+            pickle.dump(batch, f, protocol=pickle.HIGHEST_PROTOCOL)
+            count += len(batch)
+    return count
+
+def _read_spill(path):
+    """
+    Streams records back from a file written by _write_spill().
+    """
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                batch = pickle.load(f)
+            except EOFError:
+                return
+            yield from batch
+
+# External merge sort
+def sort_records(records, key, max_records=None, tmp_dir=None):
+    """
+    Sorts records, spilling sorted runs to temp files when there are more
+    than max_records of them. Runs are merged back with a k-way merge.
+    Like sorted(), the sort is stable.
+    Returns: iterable of records in key order
+    """
+    if max_records is None:
+        return sorted(records, key=key)
+
+    it = iter(records)
+    chunk = list(islice(it, max_records))
+    if len(chunk) < max_records:
+        # Everything fit in the budget, no need to touch the disk
+        chunk.sort(key=key)
+        return chunk
+
+    return _external_sort(chunk, it, key, max_records, tmp_dir)
+
+def _external_sort(chunk, it, key, max_records, tmp_dir):
+    with tempfile.TemporaryDirectory(prefix='sales_sort_', dir=tmp_dir) as work_dir:
+        runs = []
+        while chunk:
+            chunk.sort(key=key)
+            path = os.path.join(work_dir, f"run_{len(runs)}.pkl")
+            _write_spill(chunk, path)
+            runs.append(path)
+            chunk = list(islice(it, max_records))
+
+        # Merge in passes so no more than MAX_MERGE_FANIN files are open at once.
+        # Runs are merged in input order, which keeps the sort stable.
+        level = 0
+        while len(runs) > MAX_MERGE_FANIN:
+            merged = []
+            for i in range(0, len(runs), MAX_MERGE_FANIN):
+                group = runs[i:i + MAX_MERGE_FANIN]
+                path = os.path.join(work_dir, f"merge_{level}_{len(merged)}.pkl")
+                _write_spill(heapq.merge(*(_read_spill(p) for p in group), key=key), path)
+                for p in group:
+                    os.remove(p)
+                merged.append(path)
+            runs = merged
+            level += 1
+
+        yield from heapq.merge(*(_read_spill(p) for p in runs), key=key)
+
+# Hash-partitioned aggregation
+def partition_records(records, key, max_records=None, tmp_dir=None, _depth=0):
+    """
+    Splits records into partitions such that all records with the same key
+    end up in the same partition. While the input fits in max_records it is
+    returned as one in-memory partition; beyond that, records are hashed on
+    key into NUM_PARTITIONS temp files which are then loaded one at a time.
+    Yields: lists of records
+    """
+    if max_records is None:
+        yield records if isinstance(records, list) else list(records)
+        return
+
+    it = iter(records)
+    buffer = list(islice(it, max_records + 1))
+    if len(buffer) <= max_records:
+        yield buffer
+        return
+
+    with tempfile.TemporaryDirectory(prefix='sales_part_', dir=tmp_dir) as work_dir:
+        paths = [os.path.join(work_dir, f"part_{i}.pkl") for i in range(NUM_PARTITIONS)]
+        batches = [[] for _ in range(NUM_PARTITIONS)]
+        counts = [0] * NUM_PARTITIONS
+        files = [open(path, 'wb') for path in paths]
+
+        def route(record):
+            i = hash((_depth, key(record))) % NUM_PARTITIONS
+            batch = batches[i]
+            batch.append(record)
+            if len(batch) >= SPILL_BATCH_SIZE:
+                pickle.dump(batch, files[i], protocol=pickle.HIGHEST_PROTOCOL)
+                counts[i] += len(batch)
+                batches[i] = []
+
+        try:
+            for record in buffer:
+                route(record)
+            buffer.clear()
+            for record in it:
+                route(record)
+            for i, batch in enumerate(batches):
+                if batch:
+                    pickle.dump(batch, files[i], protocol=pickle.HIGHEST_PROTOCOL)
+                    counts[i] += len(batch)
+        finally:
+            for f in files:
+                f.close()
+
+        for path, count in zip(paths, counts):
+            if count > max_records and _depth < MAX_PARTITION_DEPTH:
+                # Still too big: re-split with a different salt.
+                # A single huge key can't be split and is loaded as is.
+                yield from partition_records(_read_spill(path), key, max_records, work_dir, _depth + 1)
+            elif count:
+                yield list(_read_spill(path))
+            os.remove(path)
+
+class SpillList:
+    """
+    Append-only list that moves its contents to a temp file once it holds
+    more than max_records items. Can be iterated any number of times.
+    Call close() to remove the temp file.
+    """
+
+    def __init__(self, max_records=None, tmp_dir=None):
+        self.max_records = max_records
+        self.tmp_dir = tmp_dir
+        self._items = []
+        self._path = None
+        self._count = 0
+
+    def append(self, item):
+        self._items.append(item)
+        self._count += 1
+        if self.max_records is not None and len(self._items) >= max(self.max_records, SPILL_BATCH_SIZE):
+            self._flush()
+
+    def _flush(self):
+        if self._path is None:
+            fd, self._path = tempfile.mkstemp(prefix='sales_spill_', suffix='.pkl', dir=self.tmp_dir)
+            os.close(fd)
+        with open(self._path, 'ab') as f:
+            for i in range(0, len(self._items), SPILL_BATCH_SIZE):
+                pickle.dump(self._items[i:i + SPILL_BATCH_SIZE], f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._items = []
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        if self._path is not None:
+            yield from _read_spill(self._path)
+        yield from list(self._items)
+
+    def close(self):
+        if self._path is not None:
+            os.remove(self._path)
+            self._path = None
+        self._items = []
+        self._count = 0
+
+    def __del__(self):
+        # Safety net for callers that forget close(); don't leave temp files behind
+        try:
+            self.close()
+        except OSError:
+            pass
+
+class TransactionFile:
+    """
+    Disk-backed, re-iterable view of the valid transactions in a sales data
+    file. Each pass re-reads the file, so memory use doesn't grow with its
+    size; the encoding is only detected on the first pass. The analysis
+    functions in utils.data_processor accept it wherever they accept a
+    list, and use its max_records budget to decide when to spill sorts and
+    aggregations to temp files.
+    
+    Duplicate TransactionIDs are dropped like in validate_and_filter(), keeping
+    the first or last copy (keep) and skipping IDs found in id_index. The
+    duplicates are found once with an external sort on TransactionID; the
+    dropped line numbers are sorted and kept in a SpillList, so they stay
+    within the memory budget too. Call close() when done.
+    """
+
+    def __init__(self, filename, max_records=DEFAULT_MAX_RECORDS, tmp_dir=None,
+                 region=None, min_amount=None, max_amount=None,
+                 deduplicate=True, keep='first', id_index=None):
+        if keep not in ('first', 'last'):
+            raise ValueError(f"keep must be 'first' or 'last', not {keep!r}")
+        self.filename = filename
+        self.max_records = max_records
+        self.tmp_dir = tmp_dir
+        self.region = region
+        self.min_amount = min_amount
+        self.max_amount = max_amount
+        self.deduplicate = deduplicate
+        self.keep = keep
+        self.id_index = id_index
+        self.duplicate_count = 0
+        self.previously_ingested_count = 0
+        self._encoding = None
+        self._dropped_lines = None
+        self._count = None
+
+    def _iter_valid(self):
+        if self._encoding is None:
+            self._encoding = detect_encoding(self.filename)
+            if self._encoding is None:
+                return
+        for line_no, line in enumerate(iter_sales_data(self.filename, self._encoding)):
+            t = _parse_line(line)
+            if t is not None and _is_valid(t):
+                yield line_no, t
+
+    def _iter_dropped_lines(self):
+        """
+        Yields: line numbers of the rows to drop, grouped by TransactionID
+        """
+        keyed = ((t['TransactionID'], line_no) for line_no, t in self._iter_valid())
+        ordered = sort_records(keyed, itemgetter(0), self.max_records, self.tmp_dir)
+        kept = []  # (TransactionID, line_no) awaiting an index lookup
+
+        def check_index():
+            existing = self.id_index.find_existing(t_id for t_id, _ in kept)
+            for t_id, line_no in kept:
+                if t_id in existing:
+                    self.previously_ingested_count += 1
+                    yield line_no
+            kept.clear()
+
+        for t_id, rows in groupby(ordered, key=itemgetter(0)):
+            # The sort is stable, so line numbers come out ascending
+            lines = [line_no for _, line_no in rows]
+            keep_line = lines[0] if self.keep == 'first' else lines[-1]
+            if len(lines) > 1:
+                self.duplicate_count += len(lines) - 1
+                yield from (line_no for line_no in lines if line_no != keep_line)
+            if self.id_index is not None:
+                kept.append((t_id, keep_line))
+                if len(kept) >= INDEX_LOOKUP_BATCH:
+                    yield from check_index()
+
+        if kept:
+            yield from check_index()
+
+    def _find_dropped_lines(self):
+        """
+        Sorts the dropped line numbers (externally, within max_records) so
+        each pass can skip them while scanning the file in line order.
+        Returns: SpillList of line numbers, ascending
+        """
+        # Recounted from scratch, as this runs again on a pass after close()
+        self.duplicate_count = 0
+        self.previously_ingested_count = 0
+        dropped = SpillList(self.max_records, self.tmp_dir)
+        for line_no in sort_records(self._iter_dropped_lines(), None, self.max_records, self.tmp_dir):
+            dropped.append(line_no)
+        return dropped
+
+    def __iter__(self):
+        if self.deduplicate and self._dropped_lines is None:
+            self._dropped_lines = self._find_dropped_lines()
+
+        # Both streams are in ascending line order, so a single cursor is enough
+        dropped = iter(self._dropped_lines) if self._dropped_lines is not None else iter(())
+        next_drop = next(dropped, None)
+
+        for line_no, t in self._iter_valid():
+            if next_drop == line_no:
+                next_drop = next(dropped, None)
+                continue
+            if self.region and t['Region'] != self.region:
+                continue
+            amount = t['Quantity'] * t['UnitPrice']
+            if self.min_amount is not None and amount < self.min_amount:
+                continue
+            if self.max_amount is not None and amount > self.max_amount:
+                continue
+            yield t
+
+    def close(self):
+        """
+        Removes the temp file holding dropped line numbers, if any.
+        """
+        if self._dropped_lines is not None:
+            self._dropped_lines.close()
+            self._dropped_lines = None
+
+    def __len__(self):
+        if self._count is None:
+            self._count = sum(1 for _ in self)
+        return self._count